@@ -0,0 +1,44 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled Brookes' Δ kernel (optional)
+
+Build in place with:  python setup.py build_ext --inplace
+"""
+
+from libc.stdlib cimport malloc, free, qsort
+
+
+cdef int _cmp_desc(const void* a, const void* b) noexcept nogil:
+    cdef double x = (<const double*>a)[0]
+    cdef double y = (<const double*>b)[0]
+    return (x < y) - (x > y)
+
+
+# m is never -1, so -1 can signal an exception (e.g. MemoryError) to callers
+cpdef double mean_rank_kernel(const double[::1] freq) except? -1:
+    """Return m = Σ(f × Desc_Rank) / Σf for a contiguous float64 frequency array"""
+    cdef Py_ssize_t n = freq.shape[0]
+    cdef Py_ssize_t i
+    cdef double total = 0.0
+    cdef double acc = 0.0
+    cdef double* srt
+
+    if n == 0:
+        return float('nan')
+    srt = <double*>malloc(n * sizeof(double))
+    if srt == NULL:
+        raise MemoryError()
+
+    # Sort and accumulate without the GIL so callers can run this from threads
+    with nogil:
+        for i in range(n):
+            srt[i] = freq[i]
+            total += freq[i]
+        qsort(srt, n, sizeof(double), _cmp_desc)
+        for i in range(n):
+            acc += srt[i] * (n - i)
+        free(srt)
+
+    if total == 0.0:
+        return float('nan')
+    return acc / total
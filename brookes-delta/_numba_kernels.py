@@ -0,0 +1,65 @@
+"""
+Numba kernels for BrookesDeltaCalculator.batch_delta
+
+Imported lazily by delta_calculator so Numba is only loaded when
+batch_delta is first used. Without Numba the same kernels run as plain
+Python/NumPy.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional: fall back to plain Python loops
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Inputs up to this length are sorted with an insertion sort instead of np.sort
+SMALL_SORT_MAX = 16
+
+
+@njit(cache=True)
+def sort_small_desc(freq):
+    """Return a descending copy of a short array using insertion sort"""
+    srt = freq.copy()
+    for i in range(1, srt.shape[0]):
+        x = srt[i]
+        j = i - 1
+        while j >= 0 and srt[j] < x:
+            srt[j + 1] = srt[j]
+            j -= 1
+        srt[j + 1] = x
+    return srt
+
+
+@njit(cache=True)
+def delta_kernel(freq):
+    """Return (m, Δ) for a 1-D array of frequencies; NaN for an all-zero row"""
+    s = freq.sum()
+    if s == 0.0:
+        return np.nan, np.nan
+    if freq.shape[0] <= SMALL_SORT_MAX:
+        srt = sort_small_desc(freq)
+    else:
+        srt = np.sort(freq)[::-1]
+    n = srt.shape[0]
+    acc = 0.0
+    for i in range(n):
+        acc += srt[i] * (n - i)
+    m = acc / s
+    delta = (m - 1.0) / (n - 1.0) if n > 1 else 0.0
+    return m, delta
+
+
+@njit(parallel=True, cache=True)
+def batch_delta_kernel(freq_matrix):
+    """Return Δ for every row of a 2-D frequency matrix"""
+    n_rows = freq_matrix.shape[0]
+    out = np.empty(n_rows)
+    for r in prange(n_rows):
+        out[r] = delta_kernel(freq_matrix[r])[1]
+    return out
@@ -1,10 +1,45 @@
+import numpy as np
 import pandas as pd
 from delta_calculator import BrookesDeltaCalculator
 
+# Set to e.g. 10**6 to stream very large CSV files in chunks
+CHUNKSIZE = None
+
+
+def load_frequencies(path, chunksize=None):
+    """
+    Load categories and frequencies from a CSV file as NumPy arrays
+
+    Rows without a category are dropped and the frequencies of repeated
+    categories are summed. With chunksize set, the file is streamed so the
+    full file is never held in memory.
+    """
+    read_kwargs = {
+        'usecols': ['Category', 'Frequency'],
+        'dtype': {'Category': 'string', 'Frequency': 'int64'},
+    }
+    if chunksize is None:
+        chunks = [pd.read_csv(path, **read_kwargs)]
+    else:
+        chunks = pd.read_csv(path, chunksize=chunksize, **read_kwargs)
+
+    category_ids = {}
+    # Accumulate in int64 so counts stay exact
+    totals = np.zeros(0, dtype=np.int64)
+    for chunk in chunks:
+        chunk = chunk.dropna(subset=['Category'])
+        local_codes, uniques = pd.factorize(chunk['Category'])
+        global_ids = np.array([category_ids.setdefault(c, len(category_ids)) for c in uniques],
+                              dtype=np.intp)
+        totals = np.pad(totals, (0, len(category_ids) - len(totals)))
+        np.add.at(totals, global_ids[local_codes], chunk['Frequency'].to_numpy(dtype=np.int64))
+
+    categories = np.array(list(category_ids), dtype=object)
+    return categories, totals
+
+
 # Load your data
-df = pd.read_csv('my_data.csv')
-categories = df['Category'].tolist()
-frequencies = df['Frequency'].tolist()
+categories, frequencies = load_frequencies('my_data.csv', chunksize=CHUNKSIZE)
 
 # Calculate
 calc = BrookesDeltaCalculator(categories, frequencies)
@@ -42,7 +42,7 @@ print(f"  Interpretation: {lib_results['interpretation']}")
 
 # Show the table
 print("\n📋 Detailed Calculation:")
-print(lib_results['table'][['Category', 'Frequency', 'Percentage', 'Rank']].to_string(index=False))
+print(lib_results.format_table())
 
 # ============================================
 # EXAMPLE 2: Compare two journals
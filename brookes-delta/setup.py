@@ -0,0 +1,24 @@
+"""
+Build the optional compiled Δ kernel used by delta_calculator.py:
+
+    pip install cython
+    python setup.py build_ext --inplace
+"""
+
+import sys
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+# MSVC does not understand GCC/Clang optimisation flags
+extra_compile_args = [] if sys.platform == 'win32' else ['-O3']
+
+extensions = [
+    Extension(
+        '_delta_kernel',
+        ['_delta_kernel.pyx'],
+        extra_compile_args=extra_compile_args,
+    )
+]
+
+setup(ext_modules=cythonize(extensions))
@@ -36,7 +36,7 @@ def simple_test():
    
     # Show the table
     print("\n📊 Calculation Table:")
-    print(results['table'][['Category', 'Frequency', 'Percentage', 'Rank']].to_string(index=False))
+    print(results.format_table())
    
     return results
 